@@ -16,6 +16,12 @@ from ..utils import generate_id, sanitize_string, get_logger
 
 logger = get_logger()
 
+# Connection count patterns, in priority order (followers only as a fallback)
+_CONNECTIONS_PATTERNS = (
+    re.compile(r'(\d+)\+?\s*connections?', re.IGNORECASE),
+    re.compile(r'(\d+)\s*followers?', re.IGNORECASE),
+)
+
 
 class LinkedInScraper(BaseScraper):
     """
@@ -252,21 +258,12 @@ class LinkedInScraper(BaseScraper):
     
     def _extract_connections(self, soup) -> Optional[int]:
         """Extract number of connections (approximation from public data)."""
-        # Look for connection count in various places
-        connection_text_patterns = [
-            r'(\d+)\+?\s*connections?',
-            r'(\d+)\s*followers?',
-        ]
-        
         text_content = soup.get_text()
         
-        for pattern in connection_text_patterns:
-            match = re.search(pattern, text_content, re.IGNORECASE)
+        for pattern in _CONNECTIONS_PATTERNS:
+            match = pattern.search(text_content)
             if match:
-                try:
-                    return int(match.group(1))
-                except (ValueError, IndexError):
-                    pass
+                return int(match.group(1))
         
         return None
     
@@ -68,6 +68,11 @@ class SyntheticProfileGenerator:
             ]
         }
         
+        # Flattened skill pool, built once for sampling
+        self._all_skills = tuple(
+            skill for category_skills in self.tech_skills.values() for skill in category_skills
+        )
+        
         # Job titles by seniority
         self.job_titles = {
             "entry": [
@@ -141,11 +146,8 @@ class SyntheticProfileGenerator:
             skills = random.sample(list(self.tech_skills.values())[0], random.randint(1, 3))
         elif is_gem:
             # Gems have many valuable skills
-            all_skills = []
-            for category_skills in self.tech_skills.values():
-                all_skills.extend(category_skills)
             num_skills = random.randint(15, 25)
-            skills = random.sample(all_skills, min(num_skills, len(all_skills)))
+            skills = random.sample(self._all_skills, min(num_skills, len(self._all_skills)))
         else:
             skills = self._generate_skills(seniority)
         
@@ -269,11 +271,7 @@ class SyntheticProfileGenerator:
         count = random.randint(min_skills, max_skills)
         
         # Select from multiple categories
-        all_skills = []
-        for category_skills in self.tech_skills.values():
-            all_skills.extend(category_skills)
-        
-        return random.sample(all_skills, min(count, len(all_skills)))
+        return random.sample(self._all_skills, min(count, len(self._all_skills)))
     
     def _generate_experience(self, years: int, seniority: str, is_job_hopper: bool = False) -> List[Dict]:
         """Generate work experience."""
@@ -5,11 +5,13 @@ from .helpers import (
     Timer,
     batch_items,
     calculate_similarity,
+    calculate_similarity_batch,
     chunks_dataframe,
     format_timestamp,
     generate_id,
     get_random_user_agent,
     rate_limit,
+    rate_limit_async,
     retry,
     safe_divide,
     sanitize_string,
@@ -30,9 +32,11 @@ __all__ = [
     "generate_id",
     "get_random_user_agent",
     "rate_limit",
+    "rate_limit_async",
     "retry",
     "sanitize_string",
     "calculate_similarity",
+    "calculate_similarity_batch",
     "batch_items",
     "safe_divide",
     "format_timestamp",
@@ -3,14 +3,109 @@ Configuration management system.
 Loads and validates configuration from YAML files and environment variables.
 """
 
+import functools
 import os
+import tempfile
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
 
-import yaml
 from pydantic import BaseModel, Field, field_validator
 from pydantic_settings import BaseSettings
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+ENV_PREFIX = "LINKEDIN_MATCH_"
+SKIP_VALIDATION_ENV = "PYDANTIC_SKIP_VALIDATION"
+
+
+def _load_yaml(path: Path) -> Dict[str, Any]:
+    """
+    Parse a YAML file into a plain dictionary.
+    
+    The parsed result is cached next to the file as ``<config>.cache.json``,
+    keyed by the file's mtime and size, so unchanged configs skip YAML
+    parsing on subsequent starts.
+    
+    Args:
+        path: Path to YAML file
+        
+    Returns:
+        Parsed configuration dictionary (empty if the file is empty)
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = [stat.st_mtime_ns, stat.st_size]
+    cache_path = path.with_name(path.name + ".cache.json")
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = _json.loads(f.read())
+        if cached.get("key") == key:
+            return cached["data"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+    
+    # Imported here so a cache hit never pays for importing PyYAML
+    import yaml
+    try:
+        # libyaml-backed loader is much faster when PyYAML was built against it
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+    
+    with open(path, 'rb') as f:
+        config_dict = yaml.load(f.read(), Loader=SafeLoader) or {}
+    
+    _write_cache(cache_path, {"key": key, "data": config_dict})
+    return config_dict
+
+
+def _write_cache(cache_path: Path, payload: Dict[str, Any]):
+    """Atomically write a JSON cache file, ignoring unwritable locations."""
+    try:
+        encoded = _json.dumps(payload)
+    except TypeError:
+        return
+    # Skip caching when JSON can't reproduce the YAML values (dates, int keys)
+    if _json.loads(encoded) != payload:
+        return
+    if isinstance(encoded, str):
+        encoded = encoded.encode("utf-8")
+    
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(encoded)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _set_nested(d: Dict[str, Any], keys: List[str], value: Any):
+    """Set ``value`` at the nested key path, creating intermediate dicts."""
+    for k in keys[:-1]:
+        nested = d.setdefault(k, {})
+        if nested is None:
+            # Explicit null in YAML for a section being overridden
+            nested = d[k] = {}
+        d = nested
+    d[keys[-1]] = value
+
+
+def _to_namespace(value: Any) -> Any:
+    """Recursively convert nested dicts into SimpleNamespace objects."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _to_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(v) for v in value]
+    return value
+
 
 class AppConfig(BaseModel):
     """Application configuration."""
@@ -235,38 +330,38 @@ class ConfigLoader:
         if not config_file.exists():
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
         
-        with open(config_file, 'r') as f:
-            config_dict = yaml.safe_load(f)
+        config_dict = _load_yaml(config_file)
         
         # Override with environment variables
         config_dict = self._override_with_env(config_dict)
         
-        self.config = Config(**config_dict)
+        if os.environ.get(SKIP_VALIDATION_ENV) == "1":
+            # Dev mode: attribute access without schema defaults or validation
+            self.config = _to_namespace(config_dict)
+        else:
+            # Straight to the compiled pydantic-core validator
+            self.config = Config.model_validate(config_dict)
         return self.config
     
     def _override_with_env(self, config_dict: Dict) -> Dict:
         """Override configuration with environment variables."""
-        # Example: LINKEDIN_MATCH_DATABASE_POSTGRES_PASSWORD
-        prefix = "LINKEDIN_MATCH_"
-        
-        for key, value in os.environ.items():
-            if key.startswith(prefix):
-                # Remove prefix and convert to nested dict path
-                config_key = key[len(prefix):].lower()
-                keys = config_key.split('_')
-                
-                # Navigate to nested dict
-                current = config_dict
-                for k in keys[:-1]:
-                    if k not in current:
-                        current[k] = {}
-                    current = current[k]
-                
-                # Set value
-                current[keys[-1]] = value
+        for keys, value in self._collect_env_overrides():
+            _set_nested(config_dict, keys, value)
         
         return config_dict
     
+    @staticmethod
+    def _collect_env_overrides() -> List[Tuple[List[str], str]]:
+        """Collect prefixed environment variables as (key path, value) pairs."""
+        # Example: LINKEDIN_MATCH_DATABASE_POSTGRES_PASSWORD
+        prefix = ENV_PREFIX
+        prefix_len = len(prefix)
+        return [
+            (key[prefix_len:].lower().split('_'), value)
+            for key, value in os.environ.items()
+            if key.startswith(prefix)
+        ]
+    
     def get_config(self) -> Config:
         """Get loaded configuration or load if not already loaded."""
         if not self.config:
@@ -278,6 +373,7 @@ class ConfigLoader:
 _config_loader = ConfigLoader()
 
 
+@functools.cache
 def get_config() -> Config:
     """Get global configuration instance."""
     return _config_loader.get_config()
@@ -287,4 +383,5 @@ def reload_config(config_path: Optional[str] = None):
     """Reload configuration from file."""
     global _config_loader
     _config_loader = ConfigLoader(config_path)
+    get_config.cache_clear()
     return _config_loader.load()
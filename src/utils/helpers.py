@@ -2,22 +2,71 @@
 Helper utilities and common functions used across the project.
 """
 
-import hashlib
+import asyncio
 import json
 import random
 import re
+import sys
+import threading
 import time
 from datetime import datetime
-from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+from functools import lru_cache, partial, wraps
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, TypeVar, Union
 
-import pandas as pd
-from fake_useragent import UserAgent
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 
 # Type variable for decorators
 T = TypeVar('T')
 
+_perf_counter_ns = time.perf_counter_ns
+
+# Precompiled patterns
+_RE_SPECIAL = re.compile(r'[^\w\s.,!?-]')
+_RE_DIGITS = re.compile(r'\d+')
+_RE_EXP_YEARS = (
+    re.compile(r'(\d+)\+?\s*(?:years?|yrs?)'),
+    re.compile(r'(\d+)\s*-\s*\d+\s*(?:years?|yrs?)'),
+)
+_RE_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_RE_URL = re.compile(r'^https?://[^\s]+$')
+
+# Static pool of common desktop browser user agents
+_UA_POOL = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0",
+)
+_random_user_agent = partial(random.choice, _UA_POOL)
+
+# 128-bit digests keep IDs at 32 hex characters
+_blake2b_128 = partial(blake2b, digest_size=16)
+
+
+def _dumps_sorted(data: Dict) -> bytes:
+    """
+    Serialize a dict to compact, key-sorted JSON bytes.
+    
+    Always uses the stdlib encoder so IDs do not depend on which optional
+    JSON libraries are installed.
+    """
+    return json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
 
 def generate_id(data: Union[str, Dict]) -> str:
     """
@@ -27,52 +76,87 @@ def generate_id(data: Union[str, Dict]) -> str:
         data: String or dictionary to hash
         
     Returns:
-        MD5 hash string
+        32-character BLAKE2b hex digest
     """
     if isinstance(data, dict):
-        data = json.dumps(data, sort_keys=True)
+        payload = _dumps_sorted(data)
+    else:
+        payload = data.encode()
     
-    return hashlib.md5(data.encode()).hexdigest()
+    return _blake2b_128(payload).hexdigest()
 
 
 def get_random_user_agent() -> str:
     """Get a random user agent string."""
-    try:
-        ua = UserAgent()
-        return ua.random
-    except Exception:
-        # Fallback user agents
-        fallback_uas = [
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
-        ]
-        return random.choice(fallback_uas)
+    return _random_user_agent()
 
 
 def rate_limit(calls: int, period: int):
     """
     Rate limiting decorator.
     
+    Thread-safe: each call reserves the next free slot under a lock, then
+    sleeps outside the lock until that slot.
+    
     Args:
         calls: Number of calls allowed
         period: Time period in seconds
     """
-    min_interval = period / calls
-    last_called = [0.0]
+    min_interval = float(period) / calls
+    # Closure bindings avoid module + attribute lookups per call
+    _now = time.monotonic
+    _sleep = time.sleep
     
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        lock = threading.Lock()
+        next_slot = 0.0
+        
         @wraps(func)
         def wrapper(*args, **kwargs) -> T:
-            elapsed = time.time() - last_called[0]
-            left_to_wait = min_interval - elapsed
+            nonlocal next_slot
+            
+            with lock:
+                now = _now()
+                left_to_wait = next_slot - now
+                next_slot = max(now, next_slot) + min_interval
             
             if left_to_wait > 0:
-                time.sleep(left_to_wait)
+                _sleep(left_to_wait)
             
-            ret = func(*args, **kwargs)
-            last_called[0] = time.time()
-            return ret
+            return func(*args, **kwargs)
+        
+        return wrapper
+    
+    return decorator
+
+
+def rate_limit_async(calls: int, period: int):
+    """
+    Rate limiting decorator for coroutine functions.
+    
+    Args:
+        calls: Number of calls allowed
+        period: Time period in seconds
+    """
+    min_interval = period / calls
+    
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        lock = asyncio.Lock()
+        next_slot = 0.0
+        
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            nonlocal next_slot
+            
+            async with lock:
+                now = time.monotonic()
+                left_to_wait = next_slot - now
+                next_slot = max(now, next_slot) + min_interval
+            
+            if left_to_wait > 0:
+                await asyncio.sleep(left_to_wait)
+            
+            return await func(*args, **kwargs)
         
         return wrapper
     
@@ -129,7 +213,7 @@ def sanitize_string(text: Optional[str]) -> str:
     text = " ".join(text.split())
     
     # Remove special characters (keep alphanumeric, spaces, and basic punctuation)
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    text = _RE_SPECIAL.sub('', text)
     
     return text.strip()
 
@@ -144,7 +228,7 @@ def extract_numbers(text: str) -> List[int]:
     Returns:
         List of integers found in text
     """
-    return [int(n) for n in re.findall(r'\d+', text)]
+    return [int(n) for n in _RE_DIGITS.findall(text)]
 
 
 def parse_experience_years(text: str) -> Optional[int]:
@@ -158,19 +242,29 @@ def parse_experience_years(text: str) -> Optional[int]:
         Number of years or None
     """
     # Look for patterns like "5 years", "3+ years", "2-4 years"
-    patterns = [
-        r'(\d+)\+?\s*(?:years?|yrs?)',
-        r'(\d+)\s*-\s*\d+\s*(?:years?|yrs?)',
-    ]
+    text = text.lower()
     
-    for pattern in patterns:
-        match = re.search(pattern, text.lower())
+    for pattern in _RE_EXP_YEARS:
+        match = pattern.search(text)
         if match:
             return int(match.group(1))
     
     return None
 
 
+# Common skill alias normalizations
+_SKILL_NORMALIZATIONS = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'ds': 'data science',
+    'fe': 'frontend',
+    'be': 'backend',
+}
+
+
 def normalize_skill_name(skill: str) -> str:
     """
     Normalize skill name for consistency.
@@ -184,19 +278,28 @@ def normalize_skill_name(skill: str) -> str:
     # Convert to lowercase
     skill = skill.lower().strip()
     
-    # Common normalizations
-    normalizations = {
-        'js': 'javascript',
-        'ts': 'typescript',
-        'py': 'python',
-        'ml': 'machine learning',
-        'ai': 'artificial intelligence',
-        'ds': 'data science',
-        'fe': 'frontend',
-        'be': 'backend',
-    }
+    return _SKILL_NORMALIZATIONS.get(skill, skill)
+
+
+def normalize_skills_batch(skills: List[str]) -> List[str]:
+    """
+    Normalize a list of skill names.
     
-    return normalizations.get(skill, skill)
+    Args:
+        skills: Raw skill names
+        
+    Returns:
+        Normalized skill names, in input order
+    """
+    lookup = _SKILL_NORMALIZATIONS.get
+    normalized = [skill.lower().strip() for skill in skills]
+    return [lookup(skill, skill) for skill in normalized]
+
+
+@lru_cache(maxsize=4096)
+def _fast_tokens(text: str) -> FrozenSet[str]:
+    """Lowercase and whitespace-tokenize text (cached for repeated inputs)."""
+    return frozenset(text.lower().split())
 
 
 def calculate_similarity(text1: str, text2: str) -> float:
@@ -213,32 +316,67 @@ def calculate_similarity(text1: str, text2: str) -> float:
     if not text1 or not text2:
         return 0.0
     
-    # Tokenize
-    tokens1 = set(text1.lower().split())
-    tokens2 = set(text2.lower().split())
+    return _jaccard(_fast_tokens(text1), _fast_tokens(text2))
+
+
+def calculate_similarity_batch(texts1: List[str], texts2: List[str]) -> List[float]:
+    """
+    Calculate pairwise Jaccard similarity for two aligned lists of texts.
+    
+    Each distinct text is tokenized only once across the batch.
+    
+    Args:
+        texts1: First texts
+        texts2: Second texts (same length as texts1)
+        
+    Returns:
+        Similarity score between 0 and 1 for each pair
+    """
+    if len(texts1) != len(texts2):
+        raise ValueError("texts1 and texts2 must have the same length")
     
-    # Jaccard similarity
-    intersection = len(tokens1.intersection(tokens2))
-    union = len(tokens1.union(tokens2))
+    tokens = {}
+    for text in set(texts1).union(texts2):
+        if text:
+            tokens[text] = frozenset(text.lower().split())
     
+    return [
+        _jaccard(tokens[a], tokens[b]) if a and b else 0.0
+        for a, b in zip(texts1, texts2)
+    ]
+
+
+def _jaccard(tokens1: FrozenSet[str], tokens2: FrozenSet[str]) -> float:
+    """Jaccard similarity of two token sets."""
+    union = len(tokens1 | tokens2)
     if union == 0:
         return 0.0
-    
-    return intersection / union
+    return len(tokens1 & tokens2) / union
 
 
-def batch_items(items: List[Any], batch_size: int) -> List[List[Any]]:
+def batch_items(items: Union[List[Any], "np.ndarray"], batch_size: int) -> List[Any]:
     """
     Split items into batches.
     
+    NumPy arrays are split in a single call into views of the original
+    buffer; lists are sliced.
+    
     Args:
-        items: List of items
+        items: List or array of items
         batch_size: Size of each batch
         
     Returns:
         List of batches
     """
-    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    n_items = len(items)
+    # Only an already-imported numpy can have produced an ndarray
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(items, np.ndarray):
+        if n_items == 0:
+            return []
+        return np.split(items, range(batch_size, n_items, batch_size))
+    
+    return [items[i:i + batch_size] for i in range(0, n_items, batch_size)]
 
 
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
@@ -247,18 +385,13 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
     
     Args:
         numerator: Numerator
-        denominator: Denominator
-        default: Default value if division fails
+        denominator: Denominator (zero or None returns default)
+        default: Default value if denominator is zero
         
     Returns:
         Division result or default
     """
-    try:
-        if denominator == 0:
-            return default
-        return numerator / denominator
-    except (TypeError, ZeroDivisionError):
-        return default
+    return default if not denominator else numerator / denominator
 
 
 def format_timestamp(dt: Optional[datetime] = None) -> str:
@@ -324,8 +457,7 @@ def validate_email(email: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_RE_EMAIL.match(email))
 
 
 def validate_url(url: str) -> bool:
@@ -338,8 +470,7 @@ def validate_url(url: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    pattern = r'^https?://[^\s]+$'
-    return bool(re.match(pattern, url))
+    return bool(_RE_URL.match(url))
 
 
 class Timer:
@@ -347,23 +478,30 @@ class Timer:
     
     def __init__(self, name: str = "Operation"):
         self.name = name
-        self.start_time = None
-        self.elapsed = None
+        self.start_ns = None
+        self.elapsed_ns = None
     
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_ns = _perf_counter_ns()
         return self
     
     def __exit__(self, *args):
-        self.elapsed = time.time() - self.start_time
+        self.elapsed_ns = _perf_counter_ns() - self.start_ns
+    
+    @property
+    def elapsed(self) -> Optional[float]:
+        """Elapsed time in seconds, or None if not completed."""
+        if self.elapsed_ns is None:
+            return None
+        return self.elapsed_ns / 1e9
     
     def __str__(self):
-        if self.elapsed:
-            return f"{self.name}: {self.elapsed:.2f}s"
+        if self.elapsed_ns is not None:
+            return f"{self.name}: {self.elapsed_ns / 1e9:.2f}s"
         return f"{self.name}: Not completed"
 
 
-def chunks_dataframe(df: pd.DataFrame, chunk_size: int):
+def chunks_dataframe(df: "pd.DataFrame", chunk_size: int):
     """
     Yield chunks of a DataFrame.
     
@@ -374,5 +512,7 @@ def chunks_dataframe(df: pd.DataFrame, chunk_size: int):
     Yields:
         DataFrame chunks
     """
+    # Positional slices are views; no per-chunk gather/copy
+    iloc = df.iloc
     for i in range(0, len(df), chunk_size):
-        yield df.iloc[i:i + chunk_size]
+        yield iloc[i:i + chunk_size]
@@ -4,11 +4,41 @@ Provides structured logging with rotation, retention, and custom formatting.
 """
 
 import sys
+import traceback
 from pathlib import Path
 from typing import Optional
 
 from loguru import logger
 
+try:
+    import orjson
+    
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    import json
+    
+    def _dumps(obj) -> str:
+        return json.dumps(obj, default=str)
+
+
+def _json_sink(message):
+    """Write a log record to stderr as a single JSON line."""
+    record = message.record
+    exception = record["exception"]
+    sys.stderr.write(_dumps({
+        "time": record["time"].strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+        "level": record["level"].name,
+        "module": record["module"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+        "extra": record["extra"],
+        "exception": "".join(traceback.format_exception(
+            exception.type, exception.value, exception.traceback
+        )) if exception else None,
+    }) + "\n")
+
 
 class Logger:
     """Enterprise logging system with structured output."""
@@ -46,16 +76,8 @@ class Logger:
         
         # Console handler
         if self.log_format == "json":
-            console_format = (
-                "{{"
-                '"time": "{time:YYYY-MM-DD HH:mm:ss.SSS}", '
-                '"level": "{level}", '
-                '"module": "{module}", '
-                '"function": "{function}", '
-                '"line": {line}, '
-                '"message": "{message}"'
-                "}}"
-            )
+            # Records are serialized directly instead of through a format template
+            logger.add(_json_sink, format="{message}", level=self.log_level)
         else:
             console_format = (
                 "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
@@ -63,13 +85,12 @@ class Logger:
                 "<cyan>{module}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
                 "<level>{message}</level>"
             )
-        
-        logger.add(
-            sys.stderr,
-            format=console_format,
-            level=self.log_level,
-            colorize=True if self.log_format == "text" else False,
-        )
+            logger.add(
+                sys.stderr,
+                format=console_format,
+                level=self.log_level,
+                colorize=True,
+            )
         
         # File handler
         if self.log_file:
@@ -77,17 +98,8 @@ class Logger:
             log_path.parent.mkdir(parents=True, exist_ok=True)
             
             if self.log_format == "json":
-                file_format = (
-                    "{{"
-                    '"time": "{time:YYYY-MM-DD HH:mm:ss.SSS}", '
-                    '"level": "{level}", '
-                    '"module": "{module}", '
-                    '"function": "{function}", '
-                    '"line": {line}, '
-                    '"message": "{message}", '
-                    '"extra": {extra}'
-                    "}}"
-                )
+                # serialize=True emits Loguru's own JSON record; keep the text minimal
+                file_format = "{message}"
             else:
                 file_format = console_format
             
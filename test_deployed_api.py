@@ -3,24 +3,49 @@ Test script for deployed Heroku API.
 Tests model accuracy, latency, and edge cases.
 """
 
-import requests
+import httpx
 import pandas as pd
 import numpy as np
 import time
 from typing import Dict, List
-import json
+import orjson
 
 # API Configuration
 API_URL = "https://linkedin-match-algorithm-4ce8d98dc007.herokuapp.com"
 
+# Shared HTTP/2 client: requests are multiplexed over pooled keep-alive connections
+CLIENT = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+    ),
+    timeout=10.0
+)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Model input features, in API request order
+FEATURE_COLUMNS = [
+    "skill_match_score",
+    "skill_complementarity_score",
+    "network_value_a_to_b",
+    "network_value_b_to_a",
+    "career_alignment_score",
+    "experience_gap",
+    "industry_match",
+    "geographic_score",
+    "seniority_match",
+]
+
 def test_health_check():
     """Test if API is running and model is loaded."""
     print("\n" + "="*80)
     print("TEST 1: Health Check")
     print("="*80)
     
-    response = requests.get(f"{API_URL}/health")
-    result = response.json()
+    response = CLIENT.get(f"{API_URL}/health")
+    result = orjson.loads(response.content)
     
     print(f"Status Code: {response.status_code}")
     print(f"API Status: {result['status']}")
@@ -51,14 +76,14 @@ def test_single_prediction():
     }
     
     start_time = time.time()
-    response = requests.post(
+    response = CLIENT.post(
         f"{API_URL}/api/v1/compatibility",
-        json=test_data,
-        headers={"Content-Type": "application/json"}
+        content=orjson.dumps(test_data),
+        headers=JSON_HEADERS
     )
     latency = (time.time() - start_time) * 1000  # ms
     
-    result = response.json()
+    result = orjson.loads(response.content)
     
     print(f"Status Code: {response.status_code}")
     print(f"Latency: {latency:.2f} ms")
@@ -126,11 +151,12 @@ def test_edge_cases():
     ]
     
     for test_case in test_cases:
-        response = requests.post(
+        response = CLIENT.post(
             f"{API_URL}/api/v1/compatibility",
-            json=test_case["data"]
+            content=orjson.dumps(test_case["data"]),
+            headers=JSON_HEADERS
         )
-        result = response.json()
+        result = orjson.loads(response.content)
         print(f"\n{test_case['name']}:")
         print(f"  Score: {result['compatibility_score']}")
         print(f"  Recommendation: {result['recommendation']}")
@@ -177,13 +203,14 @@ def test_batch_predictions():
     }
     
     start_time = time.time()
-    response = requests.post(
+    response = CLIENT.post(
         f"{API_URL}/api/v1/batch-score",
-        json=batch_data
+        content=orjson.dumps(batch_data),
+        headers=JSON_HEADERS
     )
     latency = (time.time() - start_time) * 1000
     
-    result = response.json()
+    result = orjson.loads(response.content)
     
     print(f"Status Code: {response.status_code}")
     print(f"Batch Latency: {latency:.2f} ms")
@@ -199,6 +226,30 @@ def test_batch_predictions():
     print("\n✅ Batch predictions passed!")
 
 
+def _score_pairs_individually(pairs: List[Dict], actuals: np.ndarray):
+    """Score pairs one request at a time, skipping any the API rejects."""
+    predictions = []
+    kept = []
+    
+    for i, pair in enumerate(pairs):
+        payload = {key: value for key, value in pair.items() if key != "pair_id"}
+        try:
+            response = CLIENT.post(
+                f"{API_URL}/api/v1/compatibility",
+                content=orjson.dumps(payload),
+                headers=JSON_HEADERS
+            )
+        except httpx.HTTPError as e:
+            print(f"  Error on pair {pair['pair_id']}: {e}")
+            continue
+        
+        if response.status_code == 200:
+            predictions.append(orjson.loads(response.content)['compatibility_score'])
+            kept.append(i)
+    
+    return np.asarray(predictions, dtype=np.float64), actuals[kept]
+
+
 def test_model_accuracy():
     """Test model accuracy against test dataset."""
     print("\n" + "="*80)
@@ -212,67 +263,73 @@ def test_model_accuracy():
         # Sample test data (100 random pairs)
         test_sample = df.sample(n=min(100, len(df)), random_state=42)
         
-        predictions = []
-        actuals = []
-        errors = []
-        
         print(f"Testing on {len(test_sample)} pairs...")
         
-        for idx, row in test_sample.iterrows():
-            test_data = {
-                "skill_match_score": float(row.get('skill_match_score', 0)),
-                "skill_complementarity_score": float(row.get('skill_complementarity_score', 0)),
-                "network_value_a_to_b": float(row.get('network_value_a_to_b', 0)),
-                "network_value_b_to_a": float(row.get('network_value_b_to_a', 0)),
-                "career_alignment_score": float(row.get('career_alignment_score', 0)),
-                "experience_gap": int(row.get('experience_gap', 0)),
-                "industry_match": float(row.get('industry_match', 0)),
-                "geographic_score": float(row.get('geographic_score', 0)),
-                "seniority_match": float(row.get('seniority_match', 0))
-            }
+        # Score every pair in a single round-trip; missing columns default to 0
+        features = test_sample.reindex(columns=FEATURE_COLUMNS, fill_value=0).fillna(0).astype(np.float64)
+        features["experience_gap"] = features["experience_gap"].astype(np.int64)
+        
+        # Drop rows the API schema would reject (scores 0-100, gap >= 0) so a
+        # single bad row cannot fail the whole batch
+        scores = features.drop(columns="experience_gap")
+        valid = (scores.ge(0) & scores.le(100)).all(axis=1) & features["experience_gap"].ge(0)
+        if not valid.all():
+            print(f"  Skipping {int((~valid).sum())} rows outside the API input ranges")
+        features = features[valid]
+        actuals = test_sample.loc[valid, 'compatibility_score'].to_numpy(dtype=np.float64)
+        features.insert(0, "pair_id", features.index.astype(str))
+        # Structured-array rows convert to native Python tuples in C
+        records = features.to_records(index=False)
+        pairs = [dict(zip(records.dtype.names, row)) for row in records.tolist()]
+        
+        predictions = np.empty(0)
+        try:
+            response = CLIENT.post(
+                f"{API_URL}/api/v1/batch-score",
+                content=orjson.dumps({"pairs": pairs}),
+                headers=JSON_HEADERS,
+                timeout=30
+            )
             
-            try:
-                response = requests.post(
-                    f"{API_URL}/api/v1/compatibility",
-                    json=test_data,
-                    timeout=10
+            if response.status_code == 200:
+                results = orjson.loads(response.content)['results']
+                predictions = np.fromiter(
+                    (item['compatibility_score'] for item in results),
+                    dtype=np.float64,
+                    count=len(results)
                 )
+            elif response.status_code == 422:
+                print("  Batch rejected (HTTP 422), scoring pairs individually...")
+                predictions, actuals = _score_pairs_individually(pairs, actuals)
+            else:
+                print(f"  Batch request failed: HTTP {response.status_code}")
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    pred_score = result['compatibility_score']
-                    actual_score = row['compatibility_score']
-                    
-                    predictions.append(pred_score)
-                    actuals.append(actual_score)
-                    errors.append(abs(pred_score - actual_score))
-                    
-            except Exception as e:
-                print(f"  Error on row {idx}: {e}")
-                continue
+        except Exception as e:
+            print(f"  Batch request failed: {e}")
         
-        if predictions:
+        if len(predictions):
             # Calculate metrics
-            mae = np.mean(errors)
-            rmse = np.sqrt(np.mean(np.array(errors) ** 2))
+            residuals = actuals - predictions
+            errors = np.abs(residuals)
+            mae = errors.mean()
+            rmse = np.sqrt(np.dot(residuals, residuals) / len(residuals))
             
             # R² score
-            ss_res = np.sum((np.array(actuals) - np.array(predictions)) ** 2)
-            ss_tot = np.sum((np.array(actuals) - np.mean(actuals)) ** 2)
-            r2 = 1 - (ss_res / ss_tot)
+            centered = actuals - actuals.mean()
+            r2 = 1 - np.dot(residuals, residuals) / np.dot(centered, centered)
             
             print(f"\n📊 Accuracy Metrics:")
             print(f"  • Samples Tested: {len(predictions)}")
             print(f"  • Mean Absolute Error (MAE): {mae:.3f}")
             print(f"  • Root Mean Squared Error (RMSE): {rmse:.3f}")
             print(f"  • R² Score: {r2:.3f}")
-            print(f"  • Max Error: {max(errors):.3f}")
-            print(f"  • Min Error: {min(errors):.3f}")
+            print(f"  • Max Error: {errors.max():.3f}")
+            print(f"  • Min Error: {errors.min():.3f}")
             
             # Score distribution
             print(f"\n📈 Score Distribution:")
-            print(f"  • Actual - Mean: {np.mean(actuals):.1f}, Std: {np.std(actuals):.1f}")
-            print(f"  • Predicted - Mean: {np.mean(predictions):.1f}, Std: {np.std(predictions):.1f}")
+            print(f"  • Actual - Mean: {actuals.mean():.1f}, Std: {actuals.std():.1f}")
+            print(f"  • Predicted - Mean: {predictions.mean():.1f}, Std: {predictions.std():.1f}")
             
             print("\n✅ Accuracy test completed!")
             
@@ -316,9 +373,10 @@ def test_latency_under_load():
     
     for i in range(n_requests):
         start = time.time()
-        response = requests.post(
+        response = CLIENT.post(
             f"{API_URL}/api/v1/compatibility",
-            json=test_data
+            content=orjson.dumps(test_data),
+            headers=JSON_HEADERS
         )
         latency = (time.time() - start) * 1000
         latencies.append(latency)
@@ -13,10 +13,12 @@ Author: Likitha Gedipudi
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import xgboost as xgb
-import pickle
+import hashlib
+import joblib
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -45,7 +47,11 @@ def load_and_prepare_data(filepath: str):
     """Load dataset and prepare features"""
     
     print("📊 Loading dataset...")
-    df = pd.read_csv(filepath)
+    try:
+        # Multithreaded Arrow CSV parser, converted to NumPy-backed columns
+        df = pd.read_csv(filepath, engine='pyarrow')
+    except ImportError:
+        df = pd.read_csv(filepath)
     print(f"   Loaded {len(df):,} samples")
     
     # Select tabular features
@@ -65,9 +71,10 @@ def load_and_prepare_data(filepath: str):
     
     for col in categorical_cols:
         if col in df.columns:
-            le = LabelEncoder()
-            df[f'{col}_encoded'] = le.fit_transform(df[col].astype(str))
-            label_encoders[col] = le
+            # Sorted categories give the same codes LabelEncoder would
+            cat = df[col].astype(str).astype('category')
+            df[f'{col}_encoded'] = cat.cat.codes.to_numpy(dtype=np.int32)
+            label_encoders[col] = dict(enumerate(cat.cat.categories))
             tabular_features.append(f'{col}_encoded')
     
     # Filter to existing columns
@@ -95,12 +102,18 @@ def train_xgboost(X_train, X_val, X_test, y_train, y_val, y_test):
     print("🌳 TRAINING XGBOOST (BASELINE)")
     print("="*60)
     
+    # Histogram tree construction, on GPU when one is available
+    device = 'cuda' if HAS_TORCH and torch.cuda.is_available() else 'cpu'
+    
     model = xgb.XGBRegressor(
         n_estimators=200,
         max_depth=6,
         learning_rate=0.1,
         subsample=0.8,
         colsample_bytree=0.8,
+        tree_method='hist',
+        device=device,
+        early_stopping_rounds=20,
         random_state=42,
         n_jobs=-1
     )
@@ -111,6 +124,8 @@ def train_xgboost(X_train, X_val, X_test, y_train, y_val, y_test):
         verbose=False
     )
     
+    print(f"   Device: {device} | Best iteration: {model.best_iteration}")
+    
     # Predictions
     y_pred_train = model.predict(X_train)
     y_pred_val = model.predict(X_val)
@@ -140,8 +155,21 @@ def train_xgboost(X_train, X_val, X_test, y_train, y_val, y_test):
 # GENERATE EMBEDDINGS
 # ============================================================
 
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'  # 384-dim embeddings
+EMBEDDING_CACHE_DIR = 'cache'
+
+
+def _embedding_cache_path(texts):
+    """Cache file path keyed by the embedding model and the text contents"""
+    digest = hashlib.blake2b(EMBEDDING_MODEL.encode(), digest_size=16)
+    for text in texts:
+        digest.update(str(text).encode())
+        digest.update(b'\0')
+    return os.path.join(EMBEDDING_CACHE_DIR, f"emb_{digest.hexdigest()}.npz")
+
+
 def generate_embeddings(user_headlines, target_headlines):
-    """Generate sentence embeddings for headlines"""
+    """Generate sentence embeddings for headlines (cached on disk)"""
     
     if not HAS_SENTENCE_TRANSFORMERS:
         print("⚠️ Sentence Transformers not available, skipping embeddings")
@@ -151,14 +179,38 @@ def generate_embeddings(user_headlines, target_headlines):
     print("🔤 GENERATING SENTENCE EMBEDDINGS")
     print("="*60)
     
-    # Use a lightweight model for speed
-    model = SentenceTransformer('all-MiniLM-L6-v2')  # 384-dim embeddings
-    
-    print("   Encoding user headlines...")
-    user_embeddings = model.encode(user_headlines, show_progress_bar=True, batch_size=256)
-    
-    print("   Encoding target headlines...")
-    target_embeddings = model.encode(target_headlines, show_progress_bar=True, batch_size=256)
+    # Headlines repeat heavily; encode each distinct one once
+    all_headlines = np.concatenate([user_headlines, target_headlines]).astype(str)
+    unique_headlines, inverse = np.unique(all_headlines, return_inverse=True)
+    print(f"   {len(unique_headlines):,} unique of {len(all_headlines):,} headlines")
+    
+    cache_path = _embedding_cache_path(unique_headlines)
+    if os.path.exists(cache_path):
+        print(f"   Loading cached embeddings from {cache_path}")
+        with np.load(cache_path) as cached:
+            unique_embeddings = cached['embeddings']
+    else:
+        # Use a lightweight model for speed
+        model = SentenceTransformer(EMBEDDING_MODEL)
+        
+        # Half precision halves memory traffic on GPU and allows larger batches
+        use_fp16 = HAS_TORCH and torch.cuda.is_available()
+        if use_fp16:
+            model.half()
+        
+        print(f"   Encoding headlines ({'fp16' if use_fp16 else 'fp32'})...")
+        unique_embeddings = model.encode(unique_headlines.tolist(), show_progress_bar=True,
+                                         batch_size=1024 if use_fp16 else 256,
+                                         convert_to_numpy=True)
+        os.makedirs(EMBEDDING_CACHE_DIR, exist_ok=True)
+        # MiniLM outputs are unit-norm, so fp16 storage loses nothing that matters
+        np.savez_compressed(cache_path, embeddings=unique_embeddings.astype(np.float16))
+    
+    # Gather back to one row per headline (fp32 for the network), then split
+    all_embeddings = unique_embeddings[inverse].astype(np.float32, copy=False)
+    n_users = len(user_headlines)
+    user_embeddings = all_embeddings[:n_users]
+    target_embeddings = all_embeddings[n_users:]
     
     print(f"   Embedding shape: {user_embeddings.shape}")
     
@@ -202,8 +254,9 @@ class HybridNet(nn.Module):
             nn.Linear(32, 1)
         )
     
-    def forward(self, embeddings, tabular):
-        embed_out = self.embed_fc(embeddings)
+    def forward(self, user_emb, target_emb, tabular):
+        # Concatenate on the device, after the per-batch transfer
+        embed_out = self.embed_fc(torch.cat([user_emb, target_emb], dim=1))
         tabular_out = self.tabular_fc(tabular)
         combined = torch.cat([embed_out, tabular_out], dim=1)
         return self.combined_fc(combined)
@@ -227,26 +280,32 @@ def train_neural_network(X_train_tab, X_val_tab, X_test_tab,
     device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
     print(f"   Device: {device}")
     
-    # Combine user and target embeddings
-    train_emb = np.concatenate([user_emb_train, target_emb_train], axis=1)
-    val_emb = np.concatenate([user_emb_val, target_emb_val], axis=1)
-    test_emb = np.concatenate([user_emb_test, target_emb_test], axis=1)
-    
-    # Convert to tensors
-    train_emb_t = torch.FloatTensor(train_emb).to(device)
-    train_tab_t = torch.FloatTensor(X_train_tab).to(device)
-    train_y_t = torch.FloatTensor(y_train).unsqueeze(1).to(device)
+    # Training tensors stay on the CPU and are streamed per batch; user and
+    # target embeddings are kept separate and concatenated inside the model
+    train_user_t = torch.from_numpy(np.ascontiguousarray(user_emb_train, dtype=np.float32))
+    train_target_t = torch.from_numpy(np.ascontiguousarray(target_emb_train, dtype=np.float32))
+    train_tab_t = torch.from_numpy(np.ascontiguousarray(X_train_tab, dtype=np.float32))
+    train_y_t = torch.from_numpy(np.asarray(y_train, dtype=np.float32)).unsqueeze(1)
     
-    val_emb_t = torch.FloatTensor(val_emb).to(device)
+    val_user_t = torch.FloatTensor(user_emb_val).to(device)
+    val_target_t = torch.FloatTensor(target_emb_val).to(device)
     val_tab_t = torch.FloatTensor(X_val_tab).to(device)
     val_y_t = torch.FloatTensor(y_val).unsqueeze(1).to(device)
     
-    test_emb_t = torch.FloatTensor(test_emb).to(device)
+    test_user_t = torch.FloatTensor(user_emb_test).to(device)
+    test_target_t = torch.FloatTensor(target_emb_test).to(device)
     test_tab_t = torch.FloatTensor(X_test_tab).to(device)
     
     # Create data loader
-    train_dataset = TensorDataset(train_emb_t, train_tab_t, train_y_t)
-    train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
+    train_dataset = TensorDataset(train_user_t, train_target_t, train_tab_t, train_y_t)
+    use_cuda = device.type == 'cuda'
+    # Worker processes only help overlap batching with GPU compute
+    num_workers = 2 if use_cuda else 0
+    train_loader = DataLoader(
+        train_dataset, batch_size=batch_size, shuffle=True,
+        pin_memory=use_cuda, num_workers=num_workers,
+        persistent_workers=num_workers > 0
+    )
     
     # Initialize model
     embedding_dim = user_emb_train.shape[1]
@@ -260,33 +319,51 @@ def train_neural_network(X_train_tab, X_val_tab, X_test_tab,
     print(f"   Tabular dim: {tabular_dim}")
     print(f"   Training for {epochs} epochs...")
     
+    # Mixed precision on GPU: bf16 where supported, otherwise fp16 with loss scaling
+    use_amp = use_cuda
+    amp_dtype = torch.bfloat16 if use_amp and torch.cuda.is_bf16_supported() else torch.float16
+    scaler = torch.cuda.amp.GradScaler(enabled=use_amp and amp_dtype == torch.float16)
+    if use_amp:
+        print(f"   Mixed precision: {str(amp_dtype).replace('torch.', '')}")
+    
     best_val_loss = float('inf')
-    best_model_state = None
+    # Single CPU-resident snapshot of the best weights, updated in place
+    best_model_state = {k: v.detach().cpu().clone() for k, v in model.state_dict().items()}
     
     for epoch in range(epochs):
         model.train()
-        train_loss = 0
+        # Accumulate on the device; read back only when the epoch is logged
+        train_loss = torch.zeros((), device=device)
         
-        for emb_batch, tab_batch, y_batch in train_loader:
+        for user_batch, target_batch, tab_batch, y_batch in train_loader:
+            # Async host-to-device copies overlap with compute when pinned
+            user_batch = user_batch.to(device, non_blocking=True)
+            target_batch = target_batch.to(device, non_blocking=True)
+            tab_batch = tab_batch.to(device, non_blocking=True)
+            y_batch = y_batch.to(device, non_blocking=True)
+            
             optimizer.zero_grad()
-            outputs = model(emb_batch, tab_batch)
-            loss = criterion(outputs, y_batch)
-            loss.backward()
-            optimizer.step()
-            train_loss += loss.item()
+            with torch.autocast(device_type=device.type, dtype=amp_dtype, enabled=use_amp):
+                outputs = model(user_batch, target_batch, tab_batch)
+                loss = criterion(outputs, y_batch)
+            scaler.scale(loss).backward()
+            scaler.step(optimizer)
+            scaler.update()
+            train_loss += loss.detach()
         
         # Validation
         model.eval()
         with torch.no_grad():
-            val_pred = model(val_emb_t, val_tab_t)
+            val_pred = model(val_user_t, val_target_t, val_tab_t)
             val_loss = criterion(val_pred, val_y_t).item()
         
         if val_loss < best_val_loss:
             best_val_loss = val_loss
-            best_model_state = model.state_dict().copy()
+            for k, v in model.state_dict().items():
+                best_model_state[k].copy_(v.detach())
         
         if (epoch + 1) % 10 == 0:
-            print(f"   Epoch {epoch+1}/{epochs} - Train Loss: {train_loss/len(train_loader):.4f} | Val Loss: {val_loss:.4f}")
+            print(f"   Epoch {epoch+1}/{epochs} - Train Loss: {train_loss.item()/len(train_loader):.4f} | Val Loss: {val_loss:.4f}")
     
     # Load best model
     model.load_state_dict(best_model_state)
@@ -294,9 +371,10 @@ def train_neural_network(X_train_tab, X_val_tab, X_test_tab,
     # Final evaluation
     model.eval()
     with torch.no_grad():
-        train_pred = model(train_emb_t, train_tab_t).cpu().numpy().flatten()
-        val_pred = model(val_emb_t, val_tab_t).cpu().numpy().flatten()
-        test_pred = model(test_emb_t, test_tab_t).cpu().numpy().flatten()
+        train_pred = model(train_user_t.to(device), train_target_t.to(device),
+                           train_tab_t.to(device)).cpu().numpy().flatten()
+        val_pred = model(val_user_t, val_target_t, val_tab_t).cpu().numpy().flatten()
+        test_pred = model(test_user_t, test_target_t, test_tab_t).cpu().numpy().flatten()
     
     metrics = {
         'train_mae': mean_absolute_error(y_train, train_pred),
@@ -361,9 +439,11 @@ if __name__ == "__main__":
     )
     
     # Save XGBoost model
-    with open('xgboost_model.pkl', 'wb') as f:
-        pickle.dump({'model': xgb_model, 'scaler': scaler, 'features': feature_names}, f)
-    print("💾 Saved XGBoost model to xgboost_model.pkl")
+    # Native binary (UBJSON) booster loads without unpickling the Python wrapper;
+    # load with xgb.Booster().load_model('xgboost_model.ubj')
+    xgb_model.get_booster().save_model('xgboost_model.ubj')
+    joblib.dump({'scaler': scaler, 'features': feature_names}, 'xgboost_preprocessing.joblib')
+    print("💾 Saved XGBoost model to xgboost_model.ubj (+ xgboost_preprocessing.joblib)")
     
     # ============================================================
     # TRAIN NEURAL NETWORK (if dependencies available)
@@ -9,8 +9,9 @@ Author: Likitha Gedipudi
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+import hashlib
+import os
 import pickle
 import warnings
 warnings.filterwarnings('ignore')
@@ -20,7 +21,6 @@ try:
     from sentence_transformers import SentenceTransformer
     import torch
     import torch.nn as nn
-    from torch.utils.data import DataLoader, TensorDataset
     HAS_DEPS = True
 except ImportError as e:
     print(f"Missing dependency: {e}")
@@ -66,17 +66,19 @@ class HybridNet(nn.Module):
         return self.combined_fc(combined)
 
 # ============================================================
-# MAIN
+# DATA PREPARATION
 # ============================================================
 
-if __name__ == "__main__" and HAS_DEPS:
-    print("="*60)
-    print("🚀 FAST NEURAL NETWORK TRAINING (10K samples)")
-    print("="*60)
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'  # 384-dim embeddings
+EMBEDDING_MAX_SEQ_LEN = 64  # headlines are short; caps attention cost
+
+
+def prepare_data(csv_path, n_samples=10000, seed=42):
+    """Sample the CSV, split it and embed the distinct headlines (fp16)"""
     
     # Load data - use subset for faster training
-    df = pd.read_csv('linkedin_match_50k_synthetic.csv')
-    df = df.sample(n=10000, random_state=42).reset_index(drop=True)
+    df = pd.read_csv(csv_path)
+    df = df.sample(n=n_samples, random_state=seed).reset_index(drop=True)
     print(f"📊 Using {len(df):,} samples for fast training")
     
     # Tabular features
@@ -89,35 +91,95 @@ if __name__ == "__main__" and HAS_DEPS:
     ]
     tabular_features = [f for f in tabular_features if f in df.columns]
     
-    X_tabular = df[tabular_features].fillna(0).values
-    y = df['compatibility_score'].values
+    X_tabular = df[tabular_features].fillna(0).to_numpy(dtype=np.float32)
+    y = df['compatibility_score'].to_numpy(dtype=np.float32)
     
     # Split
     indices = np.arange(len(y))
-    train_idx, temp_idx = train_test_split(indices, test_size=0.3, random_state=42)
-    val_idx, test_idx = train_test_split(temp_idx, test_size=0.5, random_state=42)
+    train_idx, temp_idx = train_test_split(indices, test_size=0.3, random_state=seed)
+    val_idx, test_idx = train_test_split(temp_idx, test_size=0.5, random_state=seed)
     
     print(f"   Train: {len(train_idx):,} | Val: {len(val_idx):,} | Test: {len(test_idx):,}")
     
-    # Scale
-    scaler = StandardScaler()
-    X_train = scaler.fit_transform(X_tabular[train_idx])
-    X_val = scaler.transform(X_tabular[val_idx])
-    X_test = scaler.transform(X_tabular[test_idx])
-    
-    y_train, y_val, y_test = y[train_idx], y[val_idx], y[test_idx]
-    
     # Generate embeddings
     print("\n🔤 Generating embeddings...")
-    model_st = SentenceTransformer('all-MiniLM-L6-v2')
-    
     user_headlines = df['user_headline'].fillna('').values
     target_headlines = df['target_headline'].fillna('').values
     
-    user_emb = model_st.encode(user_headlines, show_progress_bar=True, batch_size=128)
-    target_emb = model_st.encode(target_headlines, show_progress_bar=True, batch_size=128)
+    # Encode each distinct headline once (both sides together), then gather back
+    all_headlines = np.concatenate([user_headlines, target_headlines]).astype(str)
+    unique_headlines, inverse = np.unique(all_headlines, return_inverse=True)
+    print(f"   {len(unique_headlines):,} unique of {len(all_headlines):,} headlines")
+    
+    model_st = SentenceTransformer(EMBEDDING_MODEL, device='cpu')
+    model_st.max_seq_length = EMBEDDING_MAX_SEQ_LEN
+    unique_emb = model_st.encode(unique_headlines.tolist(), show_progress_bar=True,
+                                 batch_size=256, convert_to_numpy=True)
+    
+    print(f"   Embedding shape: {unique_emb.shape}")
+    
+    return {
+        'features': np.array(tabular_features),
+        'X_tabular': X_tabular,
+        'y': y,
+        'train_idx': train_idx,
+        'val_idx': val_idx,
+        'test_idx': test_idx,
+        # Stored per distinct headline; rows are gathered back via `inverse`
+        'unique_emb': unique_emb.astype(np.float16),
+        'inverse': inverse
+    }
+
+
+def load_prepared_data(csv_path, n_samples=10000, seed=42):
+    """prepare_data, cached on disk keyed by the CSV, sampling and encoder"""
+    with open(csv_path, 'rb') as f:
+        digest = hashlib.file_digest(f, 'md5')
+    # Encoder settings are part of the key so changing them invalidates the cache
+    digest.update(f"{EMBEDDING_MODEL}:{EMBEDDING_MAX_SEQ_LEN}".encode())
+    data_key = digest.hexdigest()[:8]
+    cache_path = os.path.join('cache', f"prepared_fast_{data_key}_{n_samples}_{seed}.npz")
+    
+    if os.path.exists(cache_path):
+        print(f"📦 Loading prepared splits and embeddings from {cache_path}")
+        with np.load(cache_path) as cached:
+            return {name: cached[name] for name in cached.files}
+    
+    prepared = prepare_data(csv_path, n_samples, seed)
+    os.makedirs('cache', exist_ok=True)
+    np.savez_compressed(cache_path, **prepared)
+    return prepared
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+if __name__ == "__main__" and HAS_DEPS:
+    print("="*60)
+    print("🚀 FAST NEURAL NETWORK TRAINING (10K samples)")
+    print("="*60)
+    
+    prepared = load_prepared_data('linkedin_match_50k_synthetic.csv')
+    tabular_features = prepared['features'].tolist()
+    X_tabular, y = prepared['X_tabular'], prepared['y']
+    train_idx, val_idx, test_idx = prepared['train_idx'], prepared['val_idx'], prepared['test_idx']
+    # Gather per-row embeddings from the fp16 unique set; upcast once for the network
+    all_emb = prepared['unique_emb'][prepared['inverse']].astype(np.float32)
+    user_emb, target_emb = np.split(all_emb, 2)
     
-    print(f"   Embedding shape: {user_emb.shape}")
+    # Scale
+    # Standardize in float32 with train statistics (same as StandardScaler:
+    # population std, constant columns left unscaled)
+    X_train = X_tabular[train_idx]
+    scaler_mean = X_train.mean(axis=0)
+    scaler_std = X_train.std(axis=0)
+    scaler_std[scaler_std == 0] = 1.0
+    X_train = (X_train - scaler_mean) / scaler_std
+    X_val = (X_tabular[val_idx] - scaler_mean) / scaler_std
+    X_test = (X_tabular[test_idx] - scaler_mean) / scaler_std
+    
+    y_train, y_val, y_test = y[train_idx], y[val_idx], y[test_idx]
     
     # Prepare tensors
     device = torch.device('cpu')
@@ -137,9 +199,11 @@ if __name__ == "__main__" and HAS_DEPS:
     test_emb_t = torch.FloatTensor(test_emb).to(device)
     test_tab_t = torch.FloatTensor(X_test).to(device)
     
-    # DataLoader
-    train_dataset = TensorDataset(train_emb_t, train_tab_t, train_y_t)
-    train_loader = DataLoader(train_dataset, batch_size=256, shuffle=True)
+    # Everything fits in RAM, so batches are sliced straight from the
+    # full tensors with a fresh permutation each epoch (no DataLoader)
+    batch_size = 256
+    n_train = len(train_y_t)
+    n_batches = (n_train + batch_size - 1) // batch_size
     
     # Model
     embedding_dim = user_emb.shape[1]
@@ -149,25 +213,42 @@ if __name__ == "__main__" and HAS_DEPS:
     optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
     criterion = nn.MSELoss()
     
+    # Compiled module for the training steps; `model` keeps plain
+    # state_dict keys for checkpointing and is used for evaluation
+    torch.set_num_interop_threads(1)
+    train_model = torch.compile(model, dynamic=False)
+    
+    # BF16 autocast only pays off on CPUs with native BF16 support
+    use_bf16 = torch.backends.mkldnn.is_available() and torch.ops.mkldnn._is_mkldnn_bf16_supported()
+    
     print(f"\n🧠 Training neural network...")
     print(f"   Embedding dim: {embedding_dim * 2}, Tabular dim: {tabular_dim}")
+    print(f"   Precision: {'bf16 autocast' if use_bf16 else 'fp32'}")
     
     # Train
     epochs = 30
     best_val_loss = float('inf')
-    best_model_state = None
+    # Real copies (the old dict .copy() aliased the live tensors), allocated
+    # once and overwritten in place on each improvement
+    best_model_state = {k: v.detach().clone() for k, v in model.state_dict().items()}
     
     for epoch in range(epochs):
         model.train()
-        train_loss = 0
+        # Accumulate on the device; read back only when the epoch is logged
+        train_loss = torch.zeros((), device=device)
         
-        for emb_batch, tab_batch, y_batch in train_loader:
+        perm = torch.randperm(n_train)
+        for start in range(0, n_train, batch_size):
+            idx = perm[start:start + batch_size]
+            emb_batch, tab_batch, y_batch = train_emb_t[idx], train_tab_t[idx], train_y_t[idx]
+            
             optimizer.zero_grad()
-            outputs = model(emb_batch, tab_batch)
-            loss = criterion(outputs, y_batch)
+            with torch.autocast(device_type='cpu', dtype=torch.bfloat16, enabled=use_bf16):
+                outputs = train_model(emb_batch, tab_batch)
+                loss = criterion(outputs, y_batch)
             loss.backward()
             optimizer.step()
-            train_loss += loss.item()
+            train_loss += loss.detach()
         
         # Validation
         model.eval()
@@ -177,10 +258,11 @@ if __name__ == "__main__" and HAS_DEPS:
         
         if val_loss < best_val_loss:
             best_val_loss = val_loss
-            best_model_state = model.state_dict().copy()
+            for k, v in model.state_dict().items():
+                best_model_state[k].copy_(v.detach())
         
         if (epoch + 1) % 5 == 0:
-            print(f"   Epoch {epoch+1}/{epochs} - Train Loss: {train_loss/len(train_loader):.4f} | Val Loss: {val_loss:.4f}")
+            print(f"   Epoch {epoch+1}/{epochs} - Train Loss: {train_loss.item()/n_batches:.4f} | Val Loss: {val_loss:.4f}")
     
     # Load best model
     model.load_state_dict(best_model_state)
@@ -217,7 +299,8 @@ if __name__ == "__main__" and HAS_DEPS:
         'model_state_dict': model.state_dict(),
         'embedding_dim': embedding_dim,
         'tabular_dim': tabular_dim,
-        'scaler': scaler,
+        'scaler_mean': scaler_mean,
+        'scaler_std': scaler_std,
         'features': tabular_features,
         'metrics': metrics
     }, 'hybrid_nn_model.pt')
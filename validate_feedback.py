@@ -4,8 +4,11 @@ Analyzes user feedback to calculate real accuracy metrics for resume
 """
 
 import pandas as pd
+import numpy as np
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
 
 def validate_feedback(csv_path=None):
     """
@@ -14,19 +17,17 @@ def validate_feedback(csv_path=None):
     
     # Auto-find CSV if not provided
     if csv_path is None:
-        # Check common locations
+        # Check common locations, stopping at the first match
         locations = [
-            os.path.expanduser('~/Downloads'),
-            os.path.expanduser('~/Desktop'),
-            '.'
+            Path('~/Downloads').expanduser(),
+            Path('~/Desktop').expanduser(),
+            Path('.')
         ]
         
-        for loc in locations:
-            if os.path.exists(loc):
-                for f in os.listdir(loc):
-                    if 'linkedin_match_feedback' in f and f.endswith('.csv'):
-                        csv_path = os.path.join(loc, f)
-                        break
+        csv_path = next(
+            (str(p) for loc in locations for p in loc.glob('*linkedin_match_feedback*.csv')),
+            None
+        )
         
         if csv_path is None:
             print("❌ No feedback CSV found!")
@@ -40,7 +41,11 @@ def validate_feedback(csv_path=None):
     print(f"📂 Loading: {csv_path}")
     
     # Load data
-    df = pd.read_csv(csv_path)
+    try:
+        # Multithreaded Arrow CSV parser, converted to NumPy-backed columns
+        df = pd.read_csv(csv_path, engine='pyarrow')
+    except ImportError:
+        df = pd.read_csv(csv_path)
     
     print(f"\n{'='*60}")
     print("📊 LINKEDIN MATCH FEEDBACK VALIDATION REPORT")
@@ -61,25 +66,28 @@ def validate_feedback(csv_path=None):
     # ==================== ACCURACY BY SCORE BUCKET ====================
     print(f"\n🎯 ACCURACY BY SCORE BUCKET")
     
-    # Define buckets
-    df['bucket'] = pd.cut(
-        df['score'], 
-        bins=[0, 50, 70, 100], 
-        labels=['Low (<50)', 'Medium (50-70)', 'High (70+)'],
-        include_lowest=True
-    )
-    
-    for bucket in ['High (70+)', 'Medium (50-70)', 'Low (<50)']:
-        bucket_df = df[df['bucket'] == bucket]
-        if len(bucket_df) > 0:
-            if 'High' in bucket or 'Medium' in bucket:
+    # Bucket ids 0/1/2 = Low [0, 50], Medium (50, 70], High (70, 100];
+    # counts and useful rates for all buckets come from one bincount pass
+    scores = df['score'].to_numpy(dtype=np.float64)
+    in_range = (scores >= 0) & (scores <= 100)
+    bucket_ids = np.digitize(scores[in_range], [50, 70], right=True)
+    was_useful = df['wasUseful'].to_numpy(dtype=np.float64)[in_range]
+    
+    bucket_totals = np.bincount(bucket_ids, minlength=3)
+    bucket_useful = np.bincount(bucket_ids, weights=was_useful, minlength=3)
+    bucket_rates = bucket_useful / np.maximum(bucket_totals, 1)
+    
+    for bucket_id, bucket in [(2, 'High (70+)'), (1, 'Medium (50-70)'), (0, 'Low (<50)')]:
+        count = bucket_totals[bucket_id]
+        if count > 0:
+            if bucket_id > 0:
                 # For high/medium scores, "useful" is correct
-                accuracy = bucket_df['wasUseful'].mean() * 100
-                print(f"   {bucket}: {len(bucket_df)} samples, {accuracy:.1f}% marked useful")
+                accuracy = bucket_rates[bucket_id] * 100
+                print(f"   {bucket}: {count} samples, {accuracy:.1f}% marked useful")
             else:
                 # For low scores, "not useful" is correct (we predicted skip, user agreed)
-                accuracy = (1 - bucket_df['wasUseful'].mean()) * 100
-                print(f"   {bucket}: {len(bucket_df)} samples, {accuracy:.1f}% correctly identified as skip")
+                accuracy = (1 - bucket_rates[bucket_id]) * 100
+                print(f"   {bucket}: {count} samples, {accuracy:.1f}% correctly identified as skip")
     
     # ==================== KEY METRICS FOR RESUME ====================
     print(f"\n✅ RESUME-READY METRICS")
@@ -137,7 +145,8 @@ Keep collecting feedback, then re-run this script!
     # ==================== DETAILED BREAKDOWN ====================
     print(f"\n📋 DETAILED BREAKDOWN BY PROFILE")
     print(f"{'='*60}")
-    print(df[['profileName', 'score', 'wasUseful']].to_string())
+    # Streamed as tab-separated rows instead of building one formatted string
+    df[['profileName', 'score', 'wasUseful']].to_csv(sys.stdout, sep='\t', index=False)
     
     return {
         'total': total,
@@ -148,8 +157,6 @@ Keep collecting feedback, then re-run this script!
 
 
 if __name__ == '__main__':
-    import sys
-    
     if len(sys.argv) > 1:
         validate_feedback(sys.argv[1])
     else: